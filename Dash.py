@@ -135,6 +135,8 @@ import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 
+from transport import encode_figure, log_callback_sizes
+
 # Generate dummy customer data
 np.random.seed(42)
 n_customers = 1000
@@ -158,7 +160,8 @@ df['PurchaseFrequency'] = df['PurchaseFrequency'].clip(0, 100)
 df['Income'] = df['Income'].clip(20000, 150000)
 
 # Initialize the Dash app
-app = dash.Dash(__name__)
+app = dash.Dash(__name__, compress=True)
+log_callback_sizes(app)
 
 # Define colorblind-friendly color palette
 colors = {
@@ -291,7 +294,7 @@ def update_graphs(selected_gender, age_range):
             showlegend=True
         )
     
-    return segment_dist, spending_age, income_dist, purchase_freq
+    return tuple(encode_figure(fig) for fig in [segment_dist, spending_age, income_dist, purchase_freq])
 
 if __name__ == '__main__':
-    app.run_server(debug=True)
\ No newline at end of file
+    app.run(debug=True)
\ No newline at end of file
@@ -4,6 +4,8 @@ from dash import html, dcc, Input, Output, dash_table
 import plotly.express as px
 import pandas as pd
 
+from transport import encode_figure, encode_records, log_callback_sizes
+
 
 # Load data from Excel file
 file_path = 'F:\Graduation project\work\Online Retail.xlsx'
@@ -41,7 +43,8 @@ def segment_customers(df, criteria):
     return df
 
 # Initialize the Dash app
-app = dash.Dash(__name__)
+app = dash.Dash(__name__, compress=True)
+log_callback_sizes(app)
 
 # Define color scheme for segments
 color_scheme = {
@@ -52,6 +55,15 @@ color_scheme = {
     'Lost Customers': '#B22222'
 }
 
+# Columns shown in the customer table
+customer_table_columns = [
+    {'name': 'Customer ID', 'id': 'CustomerID'},
+    {'name': 'Segment', 'id': 'Segment'},
+    {'name': 'Recency (days)', 'id': 'Recency'},
+    {'name': 'Frequency', 'id': 'Frequency'},
+    {'name': 'Monetary', 'id': 'Monetary'}
+]
+
 # App layout
 app.layout = html.Div([
     # Header
@@ -164,13 +176,7 @@ app.layout = html.Div([
                 # Customer table
                 dash_table.DataTable(
                     id='customer-table',
-                    columns=[
-                        {'name': 'Customer ID', 'id': 'CustomerID'},
-                        {'name': 'Segment', 'id': 'Segment'},
-                        {'name': 'Recency (days)', 'id': 'Recency'},
-                        {'name': 'Frequency', 'id': 'Frequency'},
-                        {'name': 'Monetary', 'id': 'Monetary'}
-                    ],
+                    columns=customer_table_columns,
                     data=[],
                     page_size=10,
                     style_table={'overflowX': 'auto'},
@@ -317,7 +323,9 @@ def update_dashboard(segmentation_criteria, search_by, search_value, segment_fil
         )
     ])
     
-    return segment_pie, segment_metrics, filtered_df.to_dict('records'), segment_details_content
+    table_data = encode_records(filtered_df, [col['id'] for col in customer_table_columns])
+
+    return encode_figure(segment_pie), encode_figure(segment_metrics), table_data, segment_details_content
 
 # Add CSS styling
 app.index_string = '''
@@ -355,4 +363,4 @@ app.index_string = '''
 
 # Run the app
 if __name__ == '__main__':
-    app.run_server(debug=True)
\ No newline at end of file
+    app.run(debug=True)
\ No newline at end of file
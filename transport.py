@@ -0,0 +1,156 @@
+'''
+Compact transport for the dashboard callbacks.
+
+Large numeric arrays in figures are sent as base64 typed arrays. Plotly.js
+only reads those from 2.28 on (bundled with dash 2.16+), so encoding is
+skipped on older dash. Set DASH_BINARY_ARRAYS=0 to send plain figures.
+
+Customer table rows only carry the columns the table shows. Set
+DASH_TRIM_TABLE_ROWS=0 to send full rows.
+
+Response compression comes from dash itself (compress=True, needs
+dash[compress]); orjson is used for callback JSON whenever it is installed.
+'''
+
+import base64
+import logging
+import os
+import re
+
+import dash
+import numpy as np
+from flask import g, has_request_context, request, request_finished
+from plotly.io.json import to_json_plotly
+
+logger = logging.getLogger(__name__)
+
+
+def _dash_supports_typed_arrays():
+    major, minor = (int(part) for part in re.match(r'(\d+)\.(\d+)', dash.__version__).groups())
+    return (major, minor) >= (2, 16)
+
+
+BINARY_ARRAYS = os.environ.get('DASH_BINARY_ARRAYS', '1') != '0' and _dash_supports_typed_arrays()
+TRIM_TABLE_ROWS = os.environ.get('DASH_TRIM_TABLE_ROWS', '1') != '0'
+
+# Arrays shorter than this stay as plain JSON lists
+MIN_ARRAY_SIZE = 64
+
+# Dtypes understood by Plotly.js typed array specs
+_TYPED_ARRAY_CODES = {
+    'int8': 'i1', 'uint8': 'u1',
+    'int16': 'i2', 'uint16': 'u2',
+    'int32': 'i4', 'uint32': 'u4',
+    'float32': 'f4', 'float64': 'f8',
+}
+
+
+def _to_typed_array(values):
+    try:
+        arr = np.asarray(values)
+    except (TypeError, ValueError):
+        # Ragged lists, e.g. hand-built customdata
+        return values
+    if arr.dtype.kind not in 'iuf' or arr.size < MIN_ARRAY_SIZE:
+        return values
+
+    # Plotly.js has no 64-bit integer or half float arrays
+    if arr.dtype.kind in 'iu' and arr.dtype.itemsize > 4:
+        i4 = np.iinfo(np.int32)
+        if i4.min <= arr.min() and arr.max() <= i4.max:
+            arr = arr.astype(np.int32)
+        else:
+            arr = arr.astype(np.float64)
+    elif arr.dtype == np.float16:
+        arr = arr.astype(np.float32)
+
+    arr = np.ascontiguousarray(arr, dtype=arr.dtype.newbyteorder('<'))
+    spec = {
+        'dtype': _TYPED_ARRAY_CODES[arr.dtype.name],
+        'bdata': base64.b64encode(arr.tobytes()).decode('ascii'),
+    }
+    if arr.ndim > 1:
+        spec['shape'] = ','.join(str(n) for n in arr.shape)
+    return spec
+
+
+def _encode_trace(obj):
+    if isinstance(obj, dict):
+        return {key: _encode_trace(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)) and obj and all(isinstance(item, dict) for item in obj):
+        # Nested object arrays such as parcoords dimensions
+        return [_encode_trace(item) for item in obj]
+    if isinstance(obj, (np.ndarray, list, tuple)):
+        return _to_typed_array(obj)
+    return obj
+
+
+def _note_encoding_savings(plain, encoded):
+    # Serializes both forms again, so only done while size logging is on
+    if has_request_context() and logger.isEnabledFor(logging.INFO):
+        saved = len(to_json_plotly(plain)) - len(to_json_plotly(encoded))
+        g.encoding_saved = g.get('encoding_saved', 0) + saved
+
+
+def encode_figure(fig):
+    '''Return the figure as a dict with large numeric trace arrays base64 encoded.'''
+    if not BINARY_ARRAYS:
+        return fig
+    fig_json = fig.to_plotly_json()
+    fig_json['data'] = [_encode_trace(trace) for trace in fig_json['data']]
+    _note_encoding_savings(fig, fig_json)
+    return fig_json
+
+
+def encode_records(df, columns):
+    '''Return DataTable rows holding only the given columns.'''
+    if not TRIM_TABLE_ROWS:
+        return df.to_dict('records')
+    records = df[columns].to_dict('records')
+    if logger.isEnabledFor(logging.INFO):
+        _note_encoding_savings(df.to_dict('records'), records)
+    return records
+
+
+def log_callback_sizes(app):
+    '''Log plain, encoded and sent bytes for every callback response of the app.'''
+    server = app.server
+
+    if not logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter('%(name)s: %(message)s'))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+
+    # Registered after dash's own compression hook, so Flask runs this one
+    # first and sees the response before it is compressed
+    @server.after_request
+    def _record_raw_size(response):
+        if request.path.endswith('_dash-update-component') and not response.direct_passthrough:
+            raw_size = response.calculate_content_length()
+            if raw_size is not None:
+                g.raw_payload_size = raw_size
+        return response
+
+    # Sent once every after_request hook (compression included) has run
+    def _log_sent_size(sender, response, **extra):
+        raw_size = g.pop('raw_payload_size', None)
+        encoding_saved = g.pop('encoding_saved', 0)
+        sent_size = response.calculate_content_length()
+        if raw_size is None or sent_size is None:
+            return
+        payload = request.get_json(silent=True) or {}
+        logger.info(
+            'callback %s: %d plain -> %d encoded -> %d sent bytes (%d saved, %s)',
+            payload.get('output', request.path),
+            raw_size + encoding_saved,
+            raw_size,
+            sent_size,
+            raw_size + encoding_saved - sent_size,
+            response.headers.get('Content-Encoding', 'identity'),
+        )
+
+    request_finished.connect(_log_sent_size, server, weak=False)
+
+    return app